@@ -0,0 +1,27 @@
+"""File helpers shared by the generator and site build scripts."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import stat
+from pathlib import Path
+
+
+def read_utf8(path: str | os.PathLike) -> str:
+    """Decode a file straight from a read-only memory map, skipping the intermediate bytes copy."""
+    if os.name == "nt":
+        return Path(path).read_bytes().decode("utf-8")
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        info = os.fstat(fd)
+        if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+        # Pipes, /dev/stdin and procfs files report size 0 and cannot be mapped; read them to EOF.
+        chunks = []
+        while chunk := os.read(fd, 1 << 16):
+            chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8")
+    finally:
+        os.close(fd)
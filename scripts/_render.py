@@ -0,0 +1,150 @@
+"""Markdown-to-HTML rendering used by the site build."""
+
+from __future__ import annotations
+
+import html
+import os
+import re
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+_LINK_RE = re.compile(r"\[(.+?)\]\((.+?)\)")
+_LONE_IMG_RE = re.compile(r'<img src="([^"]*)" alt="([^"]*)"( title="[^"]*")? />')
+
+LINE_BLANK, LINE_P, LINE_H1, LINE_H2, LINE_H3, LINE_UL, LINE_OL, LINE_IMG = range(8)
+_HEADING_MARKERS = {"# ": LINE_H1, "## ": LINE_H2, "### ": LINE_H3}
+_HEADING_TAGS = {LINE_H1: "h1", LINE_H2: "h2", LINE_H3: "h3"}
+_LIST_TAGS = {LINE_UL: "ul", LINE_OL: "ol"}
+
+
+def ol_marker_end(line: str) -> int:
+    """Return the offset just past a leading "1. " style marker, or 0 if the line has none."""
+    if not line[:1].isdecimal():
+        return 0
+    dot = line.find(".")
+    if dot < 0 or not line[:dot].isdecimal():
+        return 0
+    rest = line[dot + 1 :]
+    item = rest.lstrip()
+    return len(line) - len(item) if len(item) < len(rest) else 0
+
+
+def classify_line(line: str) -> int:
+    """Map an rstripped markdown line to its LINE_* block kind."""
+    if not line:
+        return LINE_BLANK
+    if line[:2] == "![" and "](" in line and line[-1] == ")":
+        return LINE_IMG
+    if line[0] == "#":
+        kind = _HEADING_MARKERS.get(line[: len(line) - len(line.lstrip("#")) + 1])
+        if kind:
+            return kind
+    if line[:2] == "- ":
+        return LINE_UL
+    if ol_marker_end(line):
+        return LINE_OL
+    return LINE_P
+
+
+def render_line(kind: int, line: str) -> str:
+    if kind == LINE_BLANK:
+        return ""
+
+    if kind == LINE_IMG:
+        alt = html.escape(line[2:line.index("]")])
+        src = html.escape(line[line.index("(") + 1 : -1])
+        return (
+            '<figure class="my-6 overflow-hidden rounded-xl border border-slate-700/70">'
+            f'<img src="{src}" alt="{alt}" class="w-full" />'
+            f'<figcaption class="px-4 py-2 text-sm text-slate-400">{alt}</figcaption></figure>'
+        )
+
+    tag = _HEADING_TAGS.get(kind)
+    if tag:
+        return f"<{tag}>{html.escape(line[line.index(' ') + 1:])}</{tag}>"
+
+    escaped = html.escape(line)
+    if "**" in escaped:
+        escaped = _BOLD_RE.sub(r"<strong>\1</strong>", escaped)
+    if "](" in escaped:
+        escaped = _LINK_RE.sub(r'<a class="text-cyan-300 underline" href="\2">\1</a>', escaped)
+
+    if kind == LINE_UL:
+        return f"<li>{escaped[2:]}</li>"
+    if kind == LINE_OL:
+        # The "1. " marker contains nothing html.escape rewrites, so its offset is the same in `escaped`.
+        return f"<li>{escaped[ol_marker_end(line):]}</li>"
+    return f"<p>{escaped}</p>"
+
+
+def md_line_to_html(line: str) -> str:
+    line = line.rstrip()
+    return render_line(classify_line(line), line)
+
+
+def markdown_engine() -> str:
+    """Resolve the converter selected by BLOG_MARKDOWN (default: builtin)."""
+    engine = os.getenv("BLOG_MARKDOWN", "").strip().lower() or "builtin"
+    if engine not in {"builtin", "mistune"}:
+        raise ValueError("Unsupported BLOG_MARKDOWN. Use builtin/mistune")
+    return engine
+
+
+@lru_cache(maxsize=None)
+def mistune_markdown():
+    """Build the optional mistune (>=3) converter, emitting the same link and figure markup as the built-in one."""
+    try:
+        import mistune
+    except ImportError as exc:
+        raise RuntimeError("BLOG_MARKDOWN=mistune requires the optional package: pip install 'mistune>=3'") from exc
+
+    class SiteRenderer(mistune.HTMLRenderer):
+        def link(self, text: str, url: str, title: str | None = None) -> str:
+            return super().link(text, url, title).replace("<a ", '<a class="text-cyan-300 underline" ', 1)
+
+        def paragraph(self, text: str) -> str:
+            # Like the built-in converter, only an image standing alone in its paragraph becomes a <figure>;
+            # inline images stay plain <img> tags inside the <p>.
+            lone = _LONE_IMG_RE.fullmatch(text)
+            if lone:
+                src, alt, title = lone.groups()
+                return (
+                    '<figure class="my-6 overflow-hidden rounded-xl border border-slate-700/70">'
+                    f'<img src="{src}" alt="{alt}" class="w-full"{title or ""} />'
+                    f'<figcaption class="px-4 py-2 text-sm text-slate-400">{alt}</figcaption></figure>\n'
+                )
+            return super().paragraph(text)
+
+    return mistune.create_markdown(renderer=SiteRenderer(escape=True), plugins=["strikethrough", "table"])
+
+
+def markdown_to_html(raw: str) -> str:
+    if markdown_engine() == "mistune":
+        return mistune_markdown()(raw)
+
+    lines = [line.rstrip() for line in raw.splitlines()]
+    output = []
+    for kind, group in groupby(zip(map(classify_line, lines), lines), key=itemgetter(0)):
+        rendered = "\n".join(filter(None, (render_line(kind, line) for _, line in group)))
+        tag = _LIST_TAGS.get(kind)
+        if tag:
+            output.append(f"<{tag}>\n{rendered}\n</{tag}>")
+        elif rendered:
+            output.append(rendered)
+    return "\n".join(output)
+
+
+def parse_frontmatter(raw: str) -> tuple[dict, str]:
+    if not raw.startswith("---"):
+        return {}, raw
+    end = raw.find("\n---", 3)
+    if end < 0:
+        return {}, raw
+    meta = {}
+    for line in raw[3:end].splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip()] = value.strip().strip('"')
+    return meta, raw[end + 4 :].strip()
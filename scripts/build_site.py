@@ -4,13 +4,67 @@
 from __future__ import annotations
 
 import html
+import io
+import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import _render
+from _files import read_utf8
+
 ROOT = Path(__file__).resolve().parents[1]
 PROFILE_PATH = ROOT / "config" / "author_profile.md"
 POSTS_DIR = ROOT / "generated_posts"
 SITE_DIR = ROOT / "site"
+RENDER_CACHE_PATH = SITE_DIR / ".render_cache.json"
+
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]")
+_ESCAPE_SEP = "\x00"
+
+_SHELL_PREFIX = """<!doctype html>
+<html lang=\"en\">
+<head>
+  <meta charset=\"UTF-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />
+  <title>"""
+_SHELL_MID = """</title>
+  <script src=\"https://cdn.tailwindcss.com\"></script>
+  <style>
+    .glass { backdrop-filter: blur(8px); }
+    .prose h1 { font-size: 2rem; font-weight: 800; margin-top: 1rem; margin-bottom: .75rem; }
+    .prose h2 { font-size: 1.4rem; font-weight: 700; margin-top: 1.2rem; margin-bottom: .6rem; }
+    .prose h3 { font-size: 1.1rem; font-weight: 700; margin-top: 1rem; margin-bottom: .4rem; }
+    .prose p { color: #d1d5db; line-height: 1.75; margin: .65rem 0; }
+    .prose ul, .prose ol { margin: .8rem 0 .8rem 1.1rem; color: #d1d5db; }
+    .prose li { margin: .2rem 0; }
+  </style>
+</head>
+<body class=\"min-h-screen bg-slate-950 text-slate-100\">"""
+_SHELL_SUFFIX = """</body>
+</html>"""
+
+_CARD_TMPL = (
+    '<a href="/blog/%s.html" class="group block rounded-2xl border border-slate-700/60 bg-slate-900/70 p-6 transition hover:-translate-y-0.5 hover:border-cyan-400/70 hover:shadow-[0_0_24px_rgba(34,211,238,0.2)]">'
+    '<p class="text-xs uppercase tracking-wider text-cyan-300/80">%s</p>'
+    '<h3 class="mt-2 text-xl font-semibold text-white group-hover:text-cyan-100">%s</h3>'
+    '<p class="mt-3 text-sm leading-6 text-slate-300">%s</p>'
+    '<p class="mt-5 text-sm text-cyan-300">Read article →</p>'
+    '</a>'
+)
+
+_POST_BODY_TMPL = """
+        <div class=\"pointer-events-none absolute inset-0 -z-10 bg-[radial-gradient(circle_at_0%%_10%%,rgba(56,189,248,0.10),transparent_38%%),radial-gradient(circle_at_100%%_0%%,rgba(168,85,247,0.10),transparent_30%%)]\"></div>
+        <main class=\"mx-auto max-w-3xl p-6 md:p-10\">
+          <a class=\"inline-flex rounded-full border border-slate-700 px-3 py-1 text-sm text-cyan-300 hover:border-cyan-400\" href=\"/index.html\">← Back to home</a>
+          <article class=\"prose mt-6 rounded-3xl border border-slate-700/60 bg-slate-900/75 p-8 shadow-2xl\">
+            <h1>%s</h1>
+            <p class=\"text-slate-400\">%s</p>
+            %s
+          </article>
+        </main>
+        """
 
 
 def extract_author_name(profile_raw: str) -> str:
@@ -23,115 +77,48 @@ def extract_author_name(profile_raw: str) -> str:
     return "Author"
 
 
-def md_line_to_html(line: str) -> str:
-    line = line.rstrip()
-    if not line:
-        return ""
-
-    if line.startswith("![") and "](" in line and line.endswith(")"):
-        alt = line[2:line.index("]")]
-        src = line[line.index("(") + 1 : -1]
-        return (
-            '<figure class="my-6 overflow-hidden rounded-xl border border-slate-700/70">'
-            f'<img src="{html.escape(src)}" alt="{html.escape(alt)}" class="w-full" />'
-            f'<figcaption class="px-4 py-2 text-sm text-slate-400">{html.escape(alt)}</figcaption></figure>'
-        )
-
-    escaped = html.escape(line)
-    escaped = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", escaped)
-    escaped = re.sub(r"\[(.+?)\]\((.+?)\)", r'<a class="text-cyan-300 underline" href="\2">\1</a>', escaped)
-
-    if line.startswith("### "):
-        return f"<h3>{html.escape(line[4:])}</h3>"
-    if line.startswith("## "):
-        return f"<h2>{html.escape(line[3:])}</h2>"
-    if line.startswith("# "):
-        return f"<h1>{html.escape(line[2:])}</h1>"
-    if line.startswith("- "):
-        return f"<li>{escaped[2:]}</li>"
-    if re.match(r"^\d+\.\s+", line):
-        item = re.sub(r"^\d+\.\s+", "", escaped)
-        return f"<li>{item}</li>"
-    return f"<p>{escaped}</p>"
-
-
-def markdown_to_html(raw: str) -> str:
-    lines = raw.splitlines()
-    output = []
-    in_ul = False
-    in_ol = False
-
-    for line in lines:
-        is_ul = line.startswith("- ")
-        is_ol = bool(re.match(r"^\d+\.\s+", line))
-
-        if is_ul and not in_ul:
-            if in_ol:
-                output.append("</ol>")
-                in_ol = False
-            output.append("<ul>")
-            in_ul = True
-        if is_ol and not in_ol:
-            if in_ul:
-                output.append("</ul>")
-                in_ul = False
-            output.append("<ol>")
-            in_ol = True
-        if not is_ul and in_ul:
-            output.append("</ul>")
-            in_ul = False
-        if not is_ol and in_ol:
-            output.append("</ol>")
-            in_ol = False
-
-        line_html = md_line_to_html(line)
-        if line_html:
-            output.append(line_html)
-
-    if in_ul:
-        output.append("</ul>")
-    if in_ol:
-        output.append("</ol>")
-
-    return "\n".join(output)
-
-
-def parse_frontmatter(raw: str) -> tuple[dict, str]:
-    if not raw.startswith("---"):
-        return {}, raw
-    parts = raw.split("---", 2)
-    if len(parts) < 3:
-        return {}, raw
-    meta_raw = parts[1]
-    content = parts[2].strip()
-    meta = {}
-    for line in meta_raw.splitlines():
-        if ":" in line:
-            key, value = line.split(":", 1)
-            meta[key.strip()] = value.strip().strip('"')
-    return meta, content
+def shell_html(title: str, body: str) -> str:
+    return f"{_SHELL_PREFIX}{html.escape(title)}{_SHELL_MID}{body}{_SHELL_SUFFIX}"
 
 
-def shell_html(title: str, body: str) -> str:
-    return f"""<!doctype html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"UTF-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />
-  <title>{html.escape(title)}</title>
-  <script src=\"https://cdn.tailwindcss.com\"></script>
-  <style>
-    .glass {{ backdrop-filter: blur(8px); }}
-    .prose h1 {{ font-size: 2rem; font-weight: 800; margin-top: 1rem; margin-bottom: .75rem; }}
-    .prose h2 {{ font-size: 1.4rem; font-weight: 700; margin-top: 1.2rem; margin-bottom: .6rem; }}
-    .prose h3 {{ font-size: 1.1rem; font-weight: 700; margin-top: 1rem; margin-bottom: .4rem; }}
-    .prose p {{ color: #d1d5db; line-height: 1.75; margin: .65rem 0; }}
-    .prose ul, .prose ol {{ margin: .8rem 0 .8rem 1.1rem; color: #d1d5db; }}
-    .prose li {{ margin: .2rem 0; }}
-  </style>
-</head>
-<body class=\"min-h-screen bg-slate-950 text-slate-100\">{body}</body>
-</html>"""
+def escape_many(values: list[str]) -> list[str]:
+    """html.escape a batch of strings in one scan over their NUL-joined text."""
+    escaped = html.escape(_ESCAPE_SEP.join(values)).split(_ESCAPE_SEP)
+    if len(escaped) != len(values):
+        # A value contained the separator itself; escape field by field instead.
+        return [html.escape(value) for value in values]
+    return escaped
+
+
+def load_render_cache(renderer_key: list) -> dict:
+    try:
+        cache = json.loads(RENDER_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("renderer") != renderer_key:
+        return {}
+    return cache
+
+
+def list_post_sources() -> list[os.DirEntry]:
+    if not POSTS_DIR.is_dir():
+        return []
+    with os.scandir(POSTS_DIR) as it:
+        return sorted((e for e in it if e.name.endswith(".md") and e.is_file()), key=lambda e: e.name, reverse=True)
+
+
+def render_post(source: os.DirEntry, cached_posts: dict) -> dict:
+    mtime = source.stat().st_mtime_ns
+    entry = cached_posts.get(source.name[:-3])
+    if not entry or entry.get("mtime") != mtime:
+        meta, content = _render.parse_frontmatter(read_utf8(source.path))
+        entry = {"mtime": mtime, "meta": meta, "html": _render.markdown_to_html(content)}
+    return entry
+
+
+def write_post_page(page_path: Path, post: dict) -> None:
+    body = _POST_BODY_TMPL % (post["title_esc"], post["date_esc"], post["html"])
+    page_path.write_bytes(shell_html(post["title"], body).encode("utf-8"))
 
 
 def build() -> None:
@@ -139,31 +126,47 @@ def build() -> None:
     blog_dir = SITE_DIR / "blog"
     blog_dir.mkdir(parents=True, exist_ok=True)
 
-    profile_raw = PROFILE_PATH.read_text(encoding="utf-8") if PROFILE_PATH.exists() else "# Your Name"
-    author_name = extract_author_name(profile_raw)
-
-    posts = []
-    for path in sorted(POSTS_DIR.glob("*.md"), reverse=True):
-        meta, content = parse_frontmatter(path.read_text(encoding="utf-8"))
-        posts.append(
-            {
-                "slug": path.stem,
-                "title": meta.get("title") or path.stem,
-                "summary": meta.get("summary", "Generated AI blog post"),
-                "date": meta.get("date", ""),
-                "html": markdown_to_html(content),
-            }
-        )
-
-    cards = "".join(
-        f'<a href="/blog/{p["slug"]}.html" class="group block rounded-2xl border border-slate-700/60 bg-slate-900/70 p-6 transition hover:-translate-y-0.5 hover:border-cyan-400/70 hover:shadow-[0_0_24px_rgba(34,211,238,0.2)]">'
-        f'<p class="text-xs uppercase tracking-wider text-cyan-300/80">{p["date"] or "Draft"}</p>'
-        f'<h3 class="mt-2 text-xl font-semibold text-white group-hover:text-cyan-100">{html.escape(p["title"])}</h3>'
-        f'<p class="mt-3 text-sm leading-6 text-slate-300">{html.escape(p["summary"])}</p>'
-        '<p class="mt-5 text-sm text-cyan-300">Read article →</p>'
-        '</a>'
+    renderer_key = [
+        Path(__file__).stat().st_mtime_ns,
+        Path(_render.__file__).stat().st_mtime_ns,
+        _render.markdown_engine(),
+    ]
+    cache = load_render_cache(renderer_key)
+
+    profile_mtime = PROFILE_PATH.stat().st_mtime_ns if PROFILE_PATH.exists() else 0
+    profile_entry = cache.get("profile") or {}
+    if profile_entry.get("mtime") != profile_mtime:
+        profile_raw = read_utf8(PROFILE_PATH) if PROFILE_PATH.exists() else "# Your Name"
+        profile_entry = {"mtime": profile_mtime, "author_name": extract_author_name(profile_raw)}
+    author_name = profile_entry["author_name"]
+
+    cached_posts = cache.get("posts") or {}
+    sources = list_post_sources()
+    slugs = [source.name[:-3] for source in sources]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        entries = list(pool.map(lambda source: render_post(source, cached_posts), sources))
+    rendered = dict(zip(slugs, entries))
+
+    posts = [
+        {
+            "slug": slug,
+            "title": entry["meta"].get("title") or slug,
+            "summary": entry["meta"].get("summary", "Generated AI blog post"),
+            "date": entry["meta"].get("date", ""),
+            "html": entry["html"],
+        }
+        for slug, entry in zip(slugs, entries)
+    ]
+    escaped = escape_many([post[field] for post in posts for field in ("title", "summary", "date")])
+    for post, title_esc, summary_esc, date_esc in zip(posts, escaped[0::3], escaped[1::3], escaped[2::3]):
+        post.update(title_esc=title_esc, summary_esc=summary_esc, date_esc=date_esc)
+
+    buf = io.StringIO()
+    buf.writelines(
+        _CARD_TMPL % (p["slug"], p["date_esc"] or "Draft", p["title_esc"], p["summary_esc"])
         for p in posts
     )
+    cards = buf.getvalue()
 
     if not cards:
         cards = '<p class="rounded-xl border border-dashed border-slate-700 p-6 text-slate-400">No posts yet. Add a draft to <code>blog_drafts/</code> and run the workflow.</p>'
@@ -190,22 +193,17 @@ def build() -> None:
       </section>
     </main>
     """
-    (SITE_DIR / "index.html").write_text(shell_html("AI Blog Generator", index), encoding="utf-8")
+    (SITE_DIR / "index.html").write_bytes(shell_html("AI Blog Generator", index).encode("utf-8"))
 
-    for post in posts:
-        body = f"""
-        <div class=\"pointer-events-none absolute inset-0 -z-10 bg-[radial-gradient(circle_at_0%_10%,rgba(56,189,248,0.10),transparent_38%),radial-gradient(circle_at_100%_0%,rgba(168,85,247,0.10),transparent_30%)]\"></div>
-        <main class=\"mx-auto max-w-3xl p-6 md:p-10\">
-          <a class=\"inline-flex rounded-full border border-slate-700 px-3 py-1 text-sm text-cyan-300 hover:border-cyan-400\" href=\"/index.html\">← Back to home</a>
-          <article class=\"prose mt-6 rounded-3xl border border-slate-700/60 bg-slate-900/75 p-8 shadow-2xl\">
-            <h1>{html.escape(post['title'])}</h1>
-            <p class=\"text-slate-400\">{post['date']}</p>
-            {post['html']}
-          </article>
-        </main>
-        """
-        safe_slug = re.sub(r"[^a-zA-Z0-9_-]", "", post["slug"])
-        (blog_dir / f"{safe_slug}.html").write_text(shell_html(post["title"], body), encoding="utf-8")
+    # Stems that reduce to the same safe slug share one page; keep the last post per page, as the
+    # sequential loop did, so concurrent writes never race on the same file.
+    pages = {blog_dir / f"{_SLUG_RE.sub('', post['slug'])}.html": post for post in posts}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(lambda page: write_post_page(*page), pages.items()))
+
+    RENDER_CACHE_PATH.write_bytes(
+        json.dumps({"renderer": renderer_key, "profile": profile_entry, "posts": rendered}).encode("utf-8")
+    )
 
 
 if __name__ == "__main__":
@@ -4,12 +4,26 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import http.client
 import json
 import os
+import re
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib import error, request
+from urllib import error, parse, request
+
+from _files import read_utf8
+
+HTTP_TIMEOUT = 120
+LLM_CACHE_DIR = Path(".cache/llm")
+
+_SLUG_TABLE = str.maketrans({chr(code): "-" for code in range(128) if not chr(code).isalnum()})
+_DASH_RUN_RE = re.compile(r"-+")
+_CONNECTIONS = threading.local()
 
 
 @dataclass
@@ -28,7 +42,7 @@ def env_or_default(name: str, default: str) -> str:
 def read_text(path: Path) -> str:
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
-    return path.read_text(encoding="utf-8").strip()
+    return read_utf8(path).strip()
 
 
 def extract_title(draft_content: str, draft_path: Path) -> str:
@@ -40,61 +54,70 @@ def extract_title(draft_content: str, draft_path: Path) -> str:
 
 
 def slugify(value: str) -> str:
-    keep = [ch.lower() if ch.isalnum() else "-" for ch in value]
-    slug = "".join(keep)
-    while "--" in slug:
-        slug = slug.replace("--", "-")
-    return slug.strip("-") or "generated-post"
+    if value.isascii():
+        slug = value.lower().translate(_SLUG_TABLE)
+    else:
+        slug = "".join(ch.lower() if ch.isalnum() else "-" for ch in value)
+    return _DASH_RUN_RE.sub("-", slug).strip("-") or "generated-post"
+
+
+_PROVIDER_KEY_ENVS = {
+    "openai": "OPENAI_API_KEY",
+    "openrouter": "OPENROUTER_API_KEY",
+    "nvidia": "NVIDIA_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "claude": "CLAUDE_API_KEY",
+}
+
+_PROVIDER_FACTORIES = {
+    "openai": lambda: ProviderConfig(
+        "openai",
+        env_or_default("OPENAI_MODEL", "gpt-4o-mini"),
+        os.getenv("OPENAI_API_KEY", "").strip(),
+        env_or_default("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+    ),
+    "openrouter": lambda: ProviderConfig(
+        "openrouter",
+        env_or_default("OPENROUTER_MODEL", "openai/gpt-4o-mini"),
+        os.getenv("OPENROUTER_API_KEY", "").strip(),
+        env_or_default("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+    ),
+    "nvidia": lambda: ProviderConfig(
+        "nvidia",
+        env_or_default("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct"),
+        os.getenv("NVIDIA_API_KEY", "").strip(),
+        env_or_default("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com/v1"),
+    ),
+    "gemini": lambda: ProviderConfig(
+        "gemini",
+        env_or_default("GEMINI_MODEL", "gemini-1.5-flash"),
+        os.getenv("GEMINI_API_KEY", "").strip(),
+        "https://generativelanguage.googleapis.com/v1beta",
+    ),
+    "claude": lambda: ProviderConfig(
+        "claude",
+        env_or_default("CLAUDE_MODEL", "claude-3-5-sonnet-20241022"),
+        os.getenv("CLAUDE_API_KEY", "").strip(),
+        "https://api.anthropic.com/v1",
+    ),
+}
 
 
 def provider_from_env() -> ProviderConfig:
     """Resolve provider from AI_PROVIDER or auto-detect from available API keys."""
     forced = os.getenv("AI_PROVIDER", "").strip().lower()
 
-    mapping = {
-        "openai": ProviderConfig(
-            "openai",
-            env_or_default("OPENAI_MODEL", "gpt-4o-mini"),
-            os.getenv("OPENAI_API_KEY", "").strip(),
-            env_or_default("OPENAI_BASE_URL", "https://api.openai.com/v1"),
-        ),
-        "openrouter": ProviderConfig(
-            "openrouter",
-            env_or_default("OPENROUTER_MODEL", "openai/gpt-4o-mini"),
-            os.getenv("OPENROUTER_API_KEY", "").strip(),
-            env_or_default("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
-        ),
-        "nvidia": ProviderConfig(
-            "nvidia",
-            env_or_default("NVIDIA_MODEL", "meta/llama-3.1-70b-instruct"),
-            os.getenv("NVIDIA_API_KEY", "").strip(),
-            env_or_default("NVIDIA_BASE_URL", "https://integrate.api.nvidia.com/v1"),
-        ),
-        "gemini": ProviderConfig(
-            "gemini",
-            env_or_default("GEMINI_MODEL", "gemini-1.5-flash"),
-            os.getenv("GEMINI_API_KEY", "").strip(),
-            "https://generativelanguage.googleapis.com/v1beta",
-        ),
-        "claude": ProviderConfig(
-            "claude",
-            env_or_default("CLAUDE_MODEL", "claude-3-5-sonnet-20241022"),
-            os.getenv("CLAUDE_API_KEY", "").strip(),
-            "https://api.anthropic.com/v1",
-        ),
-    }
-
     if forced:
-        if forced not in mapping:
+        if forced not in _PROVIDER_FACTORIES:
             raise ValueError("Unsupported AI_PROVIDER. Use openai/openrouter/nvidia/gemini/claude")
-        config = mapping[forced]
+        config = _PROVIDER_FACTORIES[forced]()
         if not config.api_key:
             raise RuntimeError(f"Missing key for forced provider '{forced}'")
         return config
 
-    for name in ["openai", "openrouter", "nvidia", "gemini", "claude"]:
-        if mapping[name].api_key:
-            return mapping[name]
+    for name, key_env in _PROVIDER_KEY_ENVS.items():
+        if os.getenv(key_env, "").strip():
+            return _PROVIDER_FACTORIES[name]()
 
     raise RuntimeError(
         "No API key configured. Set one key: OPENAI_API_KEY or OPENROUTER_API_KEY or NVIDIA_API_KEY "
@@ -129,11 +152,34 @@ draft_source:
 """.strip()
 
 
-def http_post_json(url: str, payload: dict, headers: dict[str, str]) -> dict:
-    data = json.dumps(payload).encode("utf-8")
-    req = request.Request(url, data=data, headers={"content-type": "application/json", **headers}, method="POST")
+@dataclass
+class PooledConnection:
+    conn: http.client.HTTPConnection
+    reused: bool = False
+
+
+def pooled_connection(scheme: str, netloc: str) -> PooledConnection:
+    """Return this thread's keep-alive connection to `netloc`, opening it on first use."""
+    pool = getattr(_CONNECTIONS, "pool", None)
+    if pool is None:
+        pool = _CONNECTIONS.pool = {}
+    pooled = pool.get((scheme, netloc))
+    if pooled is None:
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        pooled = pool[(scheme, netloc)] = PooledConnection(conn_cls(netloc, timeout=HTTP_TIMEOUT))
+    return pooled
+
+
+def drop_connection(scheme: str, netloc: str) -> None:
+    pooled = getattr(_CONNECTIONS, "pool", {}).pop((scheme, netloc), None)
+    if pooled is not None:
+        pooled.conn.close()
+
+
+def urlopen_post_json(url: str, data: bytes, headers: dict[str, str]) -> dict:
+    req = request.Request(url, data=data, headers=headers, method="POST")
     try:
-        with request.urlopen(req, timeout=120) as resp:
+        with request.urlopen(req, timeout=HTTP_TIMEOUT) as resp:
             return json.loads(resp.read().decode("utf-8"))
     except error.HTTPError as exc:
         body = exc.read().decode("utf-8", errors="ignore")
@@ -141,6 +187,39 @@ def http_post_json(url: str, payload: dict, headers: dict[str, str]) -> dict:
         raise RuntimeError(f"Provider request failed ({exc.code}) at {url}: {message}") from exc
 
 
+def http_post_json(url: str, payload: dict, headers: dict[str, str]) -> dict:
+    data = json.dumps(payload).encode("utf-8")
+    headers = {"content-type": "application/json", **headers}
+    target = parse.urlsplit(url)
+    if target.scheme not in {"http", "https"} or target.scheme in request.getproxies():
+        return urlopen_post_json(url, data, headers)
+
+    path = target.path or "/"
+    if target.query:
+        path = f"{path}?{target.query}"
+    while True:
+        pooled = pooled_connection(target.scheme, target.netloc)
+        try:
+            pooled.conn.request("POST", path, body=data, headers=headers)
+            resp = pooled.conn.getresponse()
+            body = resp.read()
+        except Exception as exc:
+            drop_connection(target.scheme, target.netloc)
+            stale = isinstance(exc, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+            if stale and pooled.reused:
+                # An idle keep-alive connection was closed by the server; resend once on a fresh one.
+                continue
+            raise
+        pooled.reused = not resp.will_close
+        break
+
+    if resp.status >= 400:
+        text = body.decode("utf-8", errors="ignore")
+        message = text[:600] if text else resp.reason
+        raise RuntimeError(f"Provider request failed ({resp.status}) at {url}: {message}")
+    return json.loads(body.decode("utf-8"))
+
+
 def generate_with_openai_compatible(config: ProviderConfig, prompt: str) -> str:
     payload = {
         "model": config.model,
@@ -196,45 +275,95 @@ def ensure_frontmatter(output: str, title: str, draft_source: str) -> str:
     )
 
 
-def write_post(output_dir: Path, title: str, content: str) -> Path:
+def write_post(output_dir: Path, title: str, content: str, taken: set[Path] | None = None) -> Path:
+    """Write the post; paths in `taken` (already written this run) are skipped with a -2, -3, ... suffix."""
     output_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"{datetime.now(timezone.utc).strftime('%Y%m%d')}-{slugify(title)}.md"
-    out_path = output_dir / filename
-    out_path.write_text(content.strip() + "\n", encoding="utf-8")
+    stem = f"{datetime.now(timezone.utc).strftime('%Y%m%d')}-{slugify(title)}"
+    out_path = output_dir / f"{stem}.md"
+    if taken is not None:
+        counter = 2
+        while out_path in taken:
+            out_path = output_dir / f"{stem}-{counter}.md"
+            counter += 1
+        taken.add(out_path)
+    out_path.write_bytes((content.strip() + "\n").encode("utf-8"))
     return out_path
 
 
+def generate_with_provider(config: ProviderConfig, prompt: str) -> str:
+    if config.name in {"openai", "openrouter", "nvidia"}:
+        return generate_with_openai_compatible(config, prompt)
+    if config.name == "gemini":
+        return generate_with_gemini(config, prompt)
+    return generate_with_claude(config, prompt)
+
+
+def generate_cached(config: ProviderConfig, prompt: str) -> str:
+    """Return the provider's response, reusing a stored one for an identical provider/model/prompt."""
+    key = hashlib.blake2b(f"{config.name}|{config.model}|{prompt}".encode("utf-8")).hexdigest()
+    cache_path = LLM_CACHE_DIR / f"{key}.txt"
+    use_cache = not os.getenv("BLOG_NO_CACHE")
+    if use_cache and cache_path.exists():
+        return cache_path.read_text(encoding="utf-8")
+
+    raw = generate_with_provider(config, prompt)
+    if use_cache and raw:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(raw, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    return raw
+
+
+async def generate_all(config: ProviderConfig, prompts: list[str]) -> list[str | BaseException]:
+    """Run provider calls concurrently, bounded by BLOG_CONCURRENCY; failed calls yield their exception."""
+    semaphore = asyncio.Semaphore(max(1, int(env_or_default("BLOG_CONCURRENCY", "4"))))
+
+    async def generate_one(prompt: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(generate_cached, config, prompt)
+
+    return await asyncio.gather(*(generate_one(prompt) for prompt in prompts), return_exceptions=True)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate blog post from markdown drafts")
     parser.add_argument("--profile", default="config/author_profile.md")
-    parser.add_argument("--draft", required=True)
+    parser.add_argument("--draft", nargs="+", required=True)
     parser.add_argument("--outdir", default="generated_posts")
     parser.add_argument("--dry-run", action="store_true")
     args = parser.parse_args()
 
     profile_md = read_text(Path(args.profile))
-    draft_path = Path(args.draft)
-    draft_md = read_text(draft_path)
+    draft_paths = [Path(draft) for draft in args.draft]
+    draft_mds = [read_text(draft_path) for draft_path in draft_paths]
 
-    title = extract_title(draft_md, draft_path)
-    prompt = build_prompt(profile_md, draft_md, draft_path.name)
+    prompts = [
+        build_prompt(profile_md, draft_md, draft_path.name) for draft_path, draft_md in zip(draft_paths, draft_mds)
+    ]
     provider = provider_from_env()
+    raws = asyncio.run(generate_all(provider, prompts))
 
-    if provider.name in {"openai", "openrouter", "nvidia"}:
-        raw = generate_with_openai_compatible(provider, prompt)
-    elif provider.name == "gemini":
-        raw = generate_with_gemini(provider, prompt)
-    else:
-        raw = generate_with_claude(provider, prompt)
+    written: set[Path] = set()
+    failed = 0
+    for draft_path, draft_md, raw in zip(draft_paths, draft_mds, raws):
+        if isinstance(raw, BaseException):
+            failed += 1
+            print(f"ERROR: {draft_path}: {raw}")
+            continue
+
+        title = extract_title(draft_md, draft_path)
+        post = ensure_frontmatter(raw, title=title, draft_source=str(draft_path))
 
-    post = ensure_frontmatter(raw, title=title, draft_source=str(draft_path))
+        if args.dry_run:
+            print(post)
+            continue
 
-    if args.dry_run:
-        print(post)
-        return
+        output_path = write_post(Path(args.outdir), title, post, taken=written)
+        print(json.dumps({"generated_post": str(output_path), "provider": provider.name, "model": provider.model}))
 
-    output_path = write_post(Path(args.outdir), title, post)
-    print(json.dumps({"generated_post": str(output_path), "provider": provider.name, "model": provider.model}))
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":